@@ -1,9 +1,13 @@
+import io
 import streamlit as st
-import pandas as pd
+import matplotlib.pyplot as plt
 from pathlib import Path
 
 from pdf_to_csv_parser import parse_multiple_statements
-from cc_expense_tracker import analyze_expenses, generate_summary_stats, find_insights, create_visualizations
+from cc_expense_tracker import (
+    analyze_expenses, generate_summary_stats, find_insights, create_visualizations,
+    format_dates, ensure_datetime, CSV_DATE_FORMAT
+)
 
 # ===============================
 # STREAMLIT APP SETTINGS
@@ -14,6 +18,67 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ===============================
+# CACHED PIPELINE
+# ===============================
+@st.cache_data(show_spinner=False)
+def _parse_pdfs(files):
+    """
+    Parse uploaded PDFs into one DataFrame
+    Keyed on the (name, bytes) of each upload, so reruns skip re-parsing
+    """
+    # Parse straight from memory instead of round-tripping through temp files
+    streams = {Path(name).stem: io.BytesIO(data) for name, data in files}
+
+    return parse_multiple_statements(streams)
+
+
+@st.cache_data(show_spinner=False)
+def _summaries(df):
+    """Build the card summary, category summary and display table for a DataFrame"""
+    # One pass over the transactions, then roll up the small (card, category) table
+    card_cat = df.groupby(['card', 'category'], observed=True)['amount'].agg(['sum', 'count'])
+
+    card_summary = card_cat.groupby(level='card', observed=True).sum().sort_values('sum', ascending=False)
+
+    cat_summary = card_cat.groupby(level='category', observed=True).sum()
+    cat_summary['mean'] = cat_summary['sum'] / cat_summary['count']
+    cat_summary = cat_summary.sort_values('sum', ascending=False)
+
+    # Copy df to avoid changing original
+    df_display = df.sort_values('date', ascending=True).copy()
+
+    # Format date column as "21 Jan 25"
+    df_display['date'] = format_dates(df_display['date'], "%d %b %y")
+    df_display = df_display.drop(columns=['bank', 'year_month'])
+    df_display['amount'] = "₹" + df_display['amount'].map("{:,.2f}".format)
+
+    df_display.columns = [col.capitalize() for col in df_display.columns]
+
+    return card_summary, cat_summary, df_display
+
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df):
+    """Serialize transactions to CSV once per DataFrame for the download button"""
+    return df.to_csv(index=False, date_format=CSV_DATE_FORMAT).encode("utf-8")
+
+
+@st.cache_data(show_spinner=False)
+def _dashboard_png(df, dpi=100):
+    """
+    Render the visualization dashboard to PNG bytes
+    Cached per DataFrame and resolution, so reruns don't redraw the figure
+    """
+    fig = create_visualizations(df, figsize=(18, 18), dpi=dpi)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
 st.title("💳 Credit Card Expense Analyzer")
 st.markdown(
     "Upload your credit card PDF statements and analyze your expenses easily!"
@@ -28,24 +93,15 @@ uploaded_files = st.file_uploader(
     accept_multiple_files=True
 )
 
-csv_file = None
+df = None
 
 if uploaded_files:
     st.success(f"{len(uploaded_files)} file(s) uploaded")
 
-    # Save uploaded PDFs temporarily
-    temp_paths = []
-    for f in uploaded_files:
-        temp_path = Path(f"temp_{f.name}")
-        with open(temp_path, "wb") as out_file:
-            out_file.write(f.read())
-        temp_paths.append(temp_path)
-
-    # Parse PDFs to DataFrame
-    df = parse_multiple_statements(temp_paths)
+    # Parse PDFs to DataFrame (cached on file contents)
+    files = tuple((f.name, f.getvalue()) for f in uploaded_files)
+    df = _parse_pdfs(files)
     if df is not None:
-        csv_file = "all_transactions_combined.csv"
-        df.to_csv(csv_file, index=False)
         st.success(f"✅ Parsed {len(df)} transactions from {len(uploaded_files)} PDFs!")
 
 # else:
@@ -59,11 +115,11 @@ if uploaded_files:
 # ===============================
 # ANALYSIS DISPLAY
 # ===============================
-if csv_file:
+if df is not None:
     st.header("📊 Expense Summary")
 
     # Use analyzer to get DataFrame back
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = ensure_datetime(df['date'])
     df = df.dropna(subset=['date', 'amount'])
 
     # -----------------------------
@@ -83,6 +139,8 @@ if csv_file:
     date_start = df['date'].min().strftime("%d %b %y")
     date_end = df['date'].max().strftime("%d %b %y")
 
+    card_summary, cat_summary, df_display = _summaries(df)
+
     summary_text = f"💰 You spent ₹{total_spent:,.2f} between {date_start} → {date_end}, with the highest transaction being ₹{highest_txn:,.2f}"
 
     # Bigger text using markdown header (h2)
@@ -92,7 +150,6 @@ if csv_file:
     # Spending by Card
     # -----------------------------
     st.markdown("\n### 💳 Spending by Card")
-    card_summary = df.groupby('card')['amount'].agg(['sum', 'count']).sort_values('sum', ascending=False)
     for card, row in card_summary.iterrows():
         st.markdown(f"- **{card}**: ₹{row['sum']:,.2f} | {int(row['count'])} txns")
 
@@ -100,7 +157,6 @@ if csv_file:
     # Spending by Category
     # -----------------------------
     st.markdown("\n### 🏷️ Spending by Category")
-    cat_summary = df.groupby('category')['amount'].agg(['sum', 'count', 'mean']).sort_values('sum', ascending=False)
     for category, row in cat_summary.iterrows():
         st.markdown(f"- **{category}**: ₹{row['sum']:,.2f} | {int(row['count'])} txns")
     # cat_df = pd.DataFrame({
@@ -123,32 +179,31 @@ if csv_file:
     # -----------------------------
     # TABLE
     # -----------------------------
-    # Copy df to avoid changing original
-    df_display = df.sort_values('date', ascending=True).copy()
-
-    # Format date column as "21 Jan 25"
-    df_display['date'] = df_display['date'].dt.strftime("%d %b %y")
-    df_display = df_display.drop(columns=['bank', 'year_month'])
-    df_display['amount'] = df_display['amount'].apply(lambda x: f"₹{x:,.2f}")
-
-    df_display.columns = [col.capitalize() for col in df_display.columns]
-
     # Show dataframe without index
     st.markdown("\n### 📄 All Transactions")
-    st.dataframe(df_display.style.hide(axis="index"))
+    st.dataframe(df_display, hide_index=True)
+    st.download_button(
+        "⬇️ Download CSV",
+        data=_csv_bytes(df),
+        file_name="all_transactions_combined.csv",
+        mime="text/csv"
+    )
 
     # -----------------------------
     # Optional: Visualizations
     # -----------------------------
     st.markdown("\n### 📈 Visualizations")
-    fig = create_visualizations(
-        df,
-        figsize=(18, 18),  # bigger figure
-        dpi=300            # higher resolution
-    )
 
-    # Display in Streamlit
-    st.pyplot(fig)
+    # Display in Streamlit (screen resolution, rendered once per dataset)
+    st.image(_dashboard_png(df), width="stretch")
+
+    # High-resolution render only happens when the download is requested
+    st.download_button(
+        "⬇️ Download hi-res charts",
+        data=lambda: _dashboard_png(df, dpi=300),
+        file_name="expense_analysis.png",
+        mime="image/png"
+    )
 
     st.success("🎉 Analysis complete!")
 
@@ -8,6 +8,8 @@ Usage:
     python analyzer.py
 """
 
+import calendar
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -29,10 +31,31 @@ sns.set_palette("husl")
 plt.rcParams['figure.figsize'] = (14, 8)
 plt.rcParams['font.size'] = 10
 
+# Date format used when transactions are written to / read from CSV
+CSV_DATE_FORMAT = '%Y-%m-%d'
+
 # ============================================================================
 # ANALYSIS FUNCTIONS
 # ============================================================================
 
+def format_dates(dates, fmt="%d %b %y"):
+    """Format a datetime Series as strings, calling strftime once per unique date"""
+    
+    codes, uniques = pd.factorize(dates)
+    
+    # Trailing None is picked up by code -1 (NaT)
+    formatted = np.append(pd.DatetimeIndex(uniques).strftime(fmt).to_numpy(dtype=object), None)
+    
+    return pd.Series(formatted[codes], index=dates.index)
+
+def ensure_datetime(dates, fmt=CSV_DATE_FORMAT):
+    """Return dates as datetime64, parsing (with an explicit format) only if they are still strings"""
+    
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    
+    return pd.to_datetime(dates, format=fmt, errors='coerce')
+
 def generate_summary_stats(df):
     """Generate summary statistics"""
     
@@ -40,10 +63,12 @@ def generate_summary_stats(df):
     print("📊 EXPENSE ANALYSIS SUMMARY")
     print("="*70)
     
+    total_spent = df['amount'].sum()
+    
     # Overall stats
     print(f"\n💰 Overall Statistics:")
     print(f"   Total Transactions: {len(df):,}")
-    print(f"   Total Spent: Rs. {df['amount'].sum():,.2f}")
+    print(f"   Total Spent: Rs. {total_spent:,.2f}")
     print(f"   Average Transaction: Rs. {df['amount'].mean():,.2f}")
     print(f"   Median Transaction: Rs. {df['amount'].median():,.2f}")
     start = df['date'].min().strftime("%d %b %y")
@@ -52,22 +77,22 @@ def generate_summary_stats(df):
     
     # Spending by bank/card
     print(f"\n💳 Spending by Card:")
-    card_totals = df.groupby('card')['amount'].agg(['sum', 'count']).sort_values('sum', ascending=False)
+    card_totals = df.groupby('card', observed=True)['amount'].agg(['sum', 'count']).sort_values('sum', ascending=False)
     for card, row in card_totals.iterrows():
-        percentage = (row['sum'] / df['amount'].sum()) * 100
+        percentage = (row['sum'] / total_spent) * 100
         print(f"   {card}: Rs. {row['sum']:,.2f} ({percentage:.1f}%) | {int(row['count'])} transactions")
     
     # Spending by category
     print(f"\n🏷️  Spending by Category:")
-    category_totals = df.groupby('category')['amount'].agg(['sum', 'count']).sort_values('sum', ascending=False)
+    category_totals = df.groupby('category', observed=True)['amount'].agg(['sum', 'count']).sort_values('sum', ascending=False)
     for category, row in category_totals.iterrows():
-        percentage = (row['sum'] / df['amount'].sum()) * 100
+        percentage = (row['sum'] / total_spent) * 100
         avg = row['sum'] / row['count']
         print(f"   {category:20s}: Rs. {row['sum']:>10,.2f} ({percentage:>5.1f}%) | {int(row['count']):>3} txns | Avg: Rs. {avg:>8,.2f}")
     
     # Top merchants
     print(f"\n🏪 Top 15 Merchants:")
-    top_merchants = df.groupby('merchant')['amount'].sum().sort_values(ascending=False).head(15)
+    top_merchants = df.groupby('merchant', observed=True)['amount'].sum().sort_values(ascending=False).head(15)
     for i, (merchant, total) in enumerate(top_merchants.items(), 1):
         # Truncate long merchant names
         merchant_display = merchant[:45] + '...' if len(merchant) > 45 else merchant
@@ -76,7 +101,7 @@ def generate_summary_stats(df):
     # Monthly breakdown
     if 'year_month' in df.columns:
         print(f"\n📅 Monthly Spending:")
-        monthly = df.groupby('year_month')['amount'].agg(['sum', 'count']).sort_index()
+        monthly = df.groupby('year_month', observed=True)['amount'].agg(['sum', 'count']).sort_index()
         for month, row in monthly.iterrows():
             avg_per_day = row['sum'] / 30  # Rough estimate
             print(f"   {month}: Rs. {row['sum']:>10,.2f} | {int(row['count']):>3} transactions | ≈₹{avg_per_day:>8,.2f}/day")
@@ -91,20 +116,27 @@ def create_visualizations(df, save_path='expense_analysis.png', figsize=(18, 18)
     
     colors = sns.color_palette("husl", 12)
     
+    # Aggregate once up front; the plots below only need plain arrays
+    category_stats = df.groupby('category', observed=True)['amount'].agg(['sum', 'size'])
+    category_totals = category_stats['sum'].sort_values(ascending=True)
+    category_counts = category_stats['size'].sort_values(ascending=False).head(8)
+    card_totals = df.groupby('card', observed=True)['amount'].sum()
+    top_merchants = df.groupby('merchant', observed=True)['amount'].sum().nlargest(10)
+    if 'year_month' in df.columns:
+        monthly = df.groupby('year_month', observed=True)['amount'].sum().sort_index()
+    
     # 1. Spending by Category (Top-left, spans 2 columns)
     ax1 = fig.add_subplot(gs[0, :2])
-    category_totals = df.groupby('category')['amount'].sum().sort_values(ascending=True)
-    ax1.barh(category_totals.index, category_totals.values, color=colors[:len(category_totals)])
+    ax1.barh(category_totals.index.to_numpy(), category_totals.to_numpy(), color=colors[:len(category_totals)])
     ax1.set_xlabel('Amount (Rs.)', fontsize=12, fontweight='bold', labelpad=10)
     ax1.set_title('Spending by Category', fontsize=14, fontweight='bold', pad=25)
     # ax1.grid(axis='x', alpha=0.3)
-    for i, v in enumerate(category_totals.values):
+    for i, v in enumerate(category_totals.to_numpy()):
         ax1.text(v, i, f' {v:,.0f}', va='center', fontsize=10)
     
     # 2. Card Distribution (Pie Chart, Top-right)
     ax2 = fig.add_subplot(gs[0, 2])
-    card_totals = df.groupby('card')['amount'].sum()
-    wedges, texts, autotexts = ax2.pie(card_totals.values, labels=card_totals.index, 
+    wedges, texts, autotexts = ax2.pie(card_totals.to_numpy(), labels=card_totals.index.to_numpy(), 
                                        autopct='%1.1f%%', startangle=90, colors=colors)
     ax2.set_title('Spending by Card', fontsize=14, fontweight='bold', pad=25)
     for autotext in autotexts:
@@ -114,25 +146,23 @@ def create_visualizations(df, save_path='expense_analysis.png', figsize=(18, 18)
     # 3. Monthly Trend (Middle row, full width)
     ax3 = fig.add_subplot(gs[1, :])
     if 'year_month' in df.columns:
-        monthly = df.groupby('year_month')['amount'].sum().sort_index()
-        ax3.plot(range(len(monthly)), monthly.values, marker='o', linewidth=2.5, 
+        ax3.plot(range(len(monthly)), monthly.to_numpy(), marker='o', linewidth=2.5, 
                  markersize=8, color='#2E86AB', markerfacecolor='#A23B72')
-        ax3.fill_between(range(len(monthly)), monthly.values, alpha=0.2, color='#2E86AB')
+        ax3.fill_between(range(len(monthly)), monthly.to_numpy(), alpha=0.2, color='#2E86AB')
         ax3.set_xticks(range(len(monthly)))
-        ax3.set_xticklabels(monthly.index, rotation=0, fontsize=11)
+        ax3.set_xticklabels(monthly.index.to_numpy(), rotation=0, fontsize=11)
         ax3.set_ylabel('Amount (Rs.)', fontsize=12, fontweight='bold', labelpad=10)
         ax3.set_title('Monthly Spending Trend', fontsize=14, fontweight='bold', pad=25)
         ax3.grid(True, alpha=0.3)
-        for i, v in enumerate(monthly.values):
+        for i, v in enumerate(monthly.to_numpy()):
             ax3.text(i, v, f'{v:,.0f}', ha='center', va='bottom', fontsize=10)
     
     # 4. Top 10 Merchants (Bottom-left, now X-axis = merchants)
     ax4 = fig.add_subplot(gs[2, :2])
-    top_merchants = df.groupby('merchant')['amount'].sum().sort_values(ascending=False).head(10)
     merchant_names = [m[:30] + '...' if len(m) > 30 else m for m in top_merchants.index]
 
     x = range(len(top_merchants))  # numeric positions for bars
-    bars = ax4.bar(x, top_merchants.values, color=colors[:len(top_merchants)])
+    bars = ax4.bar(x, top_merchants.to_numpy(), color=colors[:len(top_merchants)])
 
     # Axis labels
     ax4.set_ylabel('Amount (Rs.)', fontsize=12, fontweight='bold', labelpad=15)
@@ -147,15 +177,15 @@ def create_visualizations(df, save_path='expense_analysis.png', figsize=(18, 18)
     ax4.grid(axis='y', alpha=0.3)
 
     # Value labels above bars
-    for i, v in enumerate(top_merchants.values):
-        ax4.text(i, v + max(top_merchants.values)*0.01, f'Rs. {v:,.0f}', ha='center', fontsize=10)
+    top_max = top_merchants.max()
+    for i, v in enumerate(top_merchants.to_numpy()):
+        ax4.text(i, v + top_max*0.01, f'Rs. {v:,.0f}', ha='center', fontsize=10)
 
 
     
     # 5. Transaction Count by Category (Bottom-right)
     ax5 = fig.add_subplot(gs[2, 2])
-    category_counts = df.groupby('category').size().sort_values(ascending=False).head(8)
-    ax5.bar(category_counts.index, category_counts.values, color=colors[:len(category_counts)])
+    ax5.bar(category_counts.index.to_numpy(), category_counts.to_numpy(), color=colors[:len(category_counts)])
     ax5.set_ylabel('Number of Transactions', fontsize=12, fontweight='bold', labelpad=10)
     ax5.set_title('Transaction Count by Category', fontsize=13, fontweight='bold', pad=20)
     ax5.tick_params(axis='x', rotation=45, labelsize=10)
@@ -176,6 +206,8 @@ def find_insights(df):
     print("💡 KEY INSIGHTS")
     print("="*70)
     
+    total_spent = df['amount'].sum()
+    
     # Highest single transaction
     max_txn = df.loc[df['amount'].idxmax()]
     print(f"\n🔥 Highest Single Transaction:")
@@ -186,38 +218,45 @@ def find_insights(df):
     # Most frequent merchant
     merchant_freq = df['merchant'].value_counts()
     if len(merchant_freq) > 0:
+        merchant_totals = df.groupby('merchant', observed=True)['amount'].sum()
         top_merchant = merchant_freq.index[0]
         count = merchant_freq.iloc[0]
-        total = df[df['merchant'] == top_merchant]['amount'].sum()
+        total = merchant_totals.loc[top_merchant]
         print(f"\n🔄 Most Frequent Merchant:")
         print(f"   {top_merchant}: {count} transactions, Rs. {total:,.2f} total")
     
     # Average spending by day of week
-    df['day_of_week'] = df['date'].dt.day_name()
-    day_avg = df.groupby('day_of_week')['amount'].mean().sort_values(ascending=False)
+    # Only 7 groups, so sum/count per weekday code with bincount instead of a string groupby
+    weekday = df['date'].dt.dayofweek
+    valid = weekday.notna() & df['amount'].notna()
+    codes = weekday[valid].to_numpy(dtype=int)
+    day_sums = np.bincount(codes, weights=df.loc[valid, 'amount'].to_numpy(), minlength=7)
+    day_counts = np.bincount(codes, minlength=7)
+    has_txns = day_counts > 0
+    day_avg = pd.Series(
+        day_sums[has_txns] / day_counts[has_txns],
+        index=np.array(calendar.day_name)[has_txns]
+    ).sort_values(ascending=False)
     print(f"\n📆 Average Spending by Day:")
     for day, avg in day_avg.head(3).items():
         print(f"   {day}: Rs. {avg:,.2f}")
     
     # Category insights
     print(f"\n🎯 Category Insights:")
-    for category in df['category'].unique()[:5]:
-        cat_data = df[df['category'] == category]
-        if len(cat_data) > 0:
-            avg = cat_data['amount'].mean()
-            total = cat_data['amount'].sum()
-            count = len(cat_data)
-            print(f"   {category}: {count} txns, Avg Rs. {avg:,.2f}, Total Rs. {total:,.2f}")
+    # sort=False keeps categories in order of first appearance
+    category_stats = df.groupby('category', sort=False, observed=True)['amount'].agg(['size', 'mean', 'sum'])
+    for category, row in category_stats.head(5).iterrows():
+        print(f"   {category}: {int(row['size'])} txns, Avg Rs. {row['mean']:,.2f}, Total Rs. {row['sum']:,.2f}")
     
     # Uncategorized transactions
     uncategorized = df[df['category'] == 'Other']
     if len(uncategorized) > 0:
         unc_total = uncategorized['amount'].sum()
-        unc_pct = (unc_total / df['amount'].sum()) * 100
+        unc_pct = (unc_total / total_spent) * 100
         print(f"\n⚠️  Uncategorized Spending:")
         print(f"   Rs. {unc_total:,.2f} ({unc_pct:.1f}% of total)")
         print(f"\n   Top uncategorized merchants:")
-        unc_merchants = uncategorized.groupby('merchant')['amount'].sum().sort_values(ascending=False).head(5)
+        unc_merchants = uncategorized.groupby('merchant', observed=True)['amount'].sum().sort_values(ascending=False).head(5)
         for merchant, amount in unc_merchants.items():
             print(f"   • {merchant[:50]}: Rs. {amount:,.2f}")
 
@@ -231,9 +270,12 @@ def analyze_expenses(df):
     Returns a formatted summary string
     """
 
-    df = df.copy()
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date', 'amount'])
+    # Only build a new frame when the dates need parsing or rows need dropping;
+    # the caller's DataFrame is never modified
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=ensure_datetime(df['date']))
+    if df[['date', 'amount']].isna().any().any():
+        df = df.dropna(subset=['date', 'amount'])
 
     lines = []
 
@@ -258,8 +300,8 @@ def analyze_expenses(df):
     # Spending by CARD
     # ------------------------------
     lines.append("💳 Spending by Card:")
-    for card, amt in df.groupby('card')['amount'].sum().items():
-        count = len(df[df['card'] == card])
+    by_card = df.groupby('card', observed=True)['amount'].agg(['sum', 'size'])
+    for card, amt, count in by_card.itertuples():
         lines.append(f"  {card}: Rs. {amt:,.2f} | {count} txns")
 
     lines.append("")
@@ -268,7 +310,7 @@ def analyze_expenses(df):
     # Spending by category
     # ------------------------------
     lines.append("🏷️ Spending by Category:")
-    cat_summary = df.groupby('category')['amount'].agg(['sum', 'count', 'mean'])
+    cat_summary = df.groupby('category', observed=True)['amount'].agg(['sum', 'count', 'mean'])
     for cat, row in cat_summary.sort_values('sum', ascending=False).iterrows():
         lines.append(
             f"  {cat:15} : Rs. {row['sum']:>8,.2f} | {int(row['count'])} txns | Avg Rs. {row['mean']:,.2f}"
@@ -287,14 +329,25 @@ def analyze_expenses(df):
 # ============================================================================
 
 if __name__ == "__main__":
+    import sys
+    
+    # Emoji and ₹ in the output can't be encoded by legacy Windows consoles (cp1252)
+    sys.stdout.reconfigure(encoding='utf-8')
+    
     print("\n\n")
     print("="*70)
     print("💳 CREDIT CARD EXPENSE ANALYZER (CSV MODE)")
     print("="*70)
 
     csv_file = "all_transactions_combined.csv"
-    df = pd.read_csv(csv_file)
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    # Same dtypes the parser produces, declared up front instead of inferred
+    df = pd.read_csv(csv_file, dtype={
+        'amount': 'float64',
+        'bank': 'category',
+        'card': 'category',
+        'category': 'category',
+    })
+    df['date'] = ensure_datetime(df['date'])
 
     # 1️⃣ PRINT TEXT SUMMARY
     summary = analyze_expenses(df)
@@ -10,16 +10,25 @@ Or import and use:
     df = parse_statement('statement.pdf')
 """
 
-import PyPDF2
+import numpy as np
 import pandas as pd
+import os
+import pypdfium2 as pdfium
 import re
-from datetime import datetime
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ============================================================================
 # AXIS BANK FLIPKART PARSER
 # ============================================================================
 
+# Pattern to match transaction lines
+# Date format: DD MMM 'YY (e.g., "09 Dec '25")
+AXIS_TRANSACTION_PATTERN = re.compile(
+    r"(?P<date>\d{1,2}\s+\w{3}\s+'\d{2})\s+(?P<merchant>.+?)\s+₹\s*(?P<amount>[\d,]+\.?\d*)\s+(?P<type>Debit|Credit)"
+)
+
 def parse_axis(text, card):
     """
     Parse Axis Bank Flipkart credit card statement
@@ -29,44 +38,38 @@ def parse_axis(text, card):
     09 Dec '25 | FLIPKART PAYMENTS,BANGALORE | ₹ 534.00 | Debit
     """
     
-    transactions = []
-    lines = text.split('\n')
+    lines = pd.Series(text.split('\n'))
     
-    # Pattern to match transaction lines
-    # Date format: DD MMM 'YY (e.g., "09 Dec '25")
-    pattern = r"(\d{1,2}\s+\w{3}\s+'\d{2})\s+(.+?)\s+₹\s*([\d,]+\.?\d*)\s+(Debit|Credit)"
+    # Cheap literal check first, so the regex only runs on lines that can hold a debit
+    lines = lines[lines.str.contains('Debit', regex=False)]
     
-    for line in lines:
-        match = re.search(pattern, line)
-        if match:
-            date_str, merchant, amount_str, trans_type = match.groups()
-            
-            # Only include debits (actual spending)
-            if trans_type == "Debit":
-                # Parse date
-                date = datetime.strptime(date_str, "%d %b '%y")
-                
-                # Clean amount
-                amount = float(amount_str.replace(',', ''))
-                
-                # Clean merchant name
-                merchant = merchant.strip()
-                
-                transactions.append({
-                    'date': date,
-                    'merchant': merchant,
-                    'amount': amount,
-                    'category': None,  # Will categorize later
-                    'bank': 'Axis',
-                    'card': card,
-                })
+    # Match every candidate line in one vectorized pass (first match per line)
+    matches = lines.str.extract(AXIS_TRANSACTION_PATTERN).dropna()
     
-    return pd.DataFrame(transactions)
+    # Only include debits (actual spending)
+    debits = matches[matches['type'] == 'Debit']
+    
+    df = pd.DataFrame({
+        'date': pd.to_datetime(debits['date'], format="%d %b '%y"),
+        'merchant': debits['merchant'].str.strip(),
+        'amount': debits['amount'].str.replace(',', '', regex=False).astype(float),
+        'category': None,  # Will categorize later
+        'bank': 'Axis',
+        'card': card,
+    })
+    
+    # Sorted per statement so the combined merge sort sees presorted runs
+    return df.sort_values('date', kind='mergesort', ignore_index=True)
 
 # ============================================================================
 # HDFC TATA NEU PARSER
 # ============================================================================
 
+# Pattern to match transaction lines
+HDFC_TRANSACTION_PATTERN = re.compile(
+    r"(?P<date>\d{2}/\d{2}/\d{4})\|\s*(?P<time>\d{2}:\d{2})\s+(?P<merchant>.+?)(?:\s+\+\s*\d+)?\s*(?P<type>[+-]?\s*C)\s*(?P<amount>[\d,]+(?:\.\d{2})?)"
+)
+
 def parse_hdfc(text, card):
     """
     Parse HDFC Tata Neu credit card statement
@@ -81,55 +84,46 @@ def parse_hdfc(text, card):
     - PI column has category indicator (l = specific category)
     """
     
-    transactions = []
-    lines = text.split('\n')
+    lines = pd.Series(text.split('\n'))
+    
+    # Cheap literal check first: transaction rows always carry the "date|" separator
+    lines = lines[lines.str.contains('|', regex=False)]
     
-    # Pattern to match transaction lines
-    pattern = r"(\d{2}/\d{2}/\d{4})\|\s*(\d{2}:\d{2})\s+(.+?)(?:\s+\+\s*\d+)?\s*([+-]?\s*C)\s*([\d,]+(?:\.\d{2})?)"
+    # Skip payment lines
+    is_payment = lines.str.upper().str.contains('PAYMENT', regex=False) | lines.str.contains('BPPY', regex=False)
+    
+    # Match every remaining line in one vectorized pass (first match per line)
+    matches = lines[~is_payment].str.extract(HDFC_TRANSACTION_PATTERN).dropna()
+    
+    # Skip credits (+ before C); we only want spending/debits
+    debits = matches[~matches['type'].str.strip().str.startswith('+')]
+    
+    # Drop rows whose date could not be parsed
+    dates = pd.to_datetime(debits['date'], format="%d/%m/%Y", errors='coerce')
+    debits = debits[dates.notna()]
+    merchants = debits['merchant'].str.strip()
+    
+    # Build each column once, then the frame in a single step
+    df = pd.DataFrame({
+        'date': dates[dates.notna()],
+        'merchant': merchants,
+        'amount': debits['amount'].str.replace(',', '', regex=False).astype(float),
+        'category': match_categories(merchants, HDFC_CATEGORY_PATTERNS),  # Try to extract category from merchant name
+        'bank': 'HDFC',
+        'card': card,
+    })
+    
+    # Sorted per statement so the combined merge sort sees presorted runs
+    return df.sort_values('date', kind='mergesort', ignore_index=True)
 
 
-    for line in lines:
-        # Skip payment lines
-        if 'PAYMENT' in line.upper() or 'BPPY' in line:
-            continue
-        
-        # Try detailed pattern first
-        match = re.search(pattern, line)
-        if match:
-            date_str, time_str, merchant, txn_type, amount_str = match.groups()
-            
-            # Check if it's a credit (has + before C)
-            is_credit = txn_type.strip().startswith('+')
-            
-            # Skip credits (we only want spending/debits)
-            if is_credit:
-                continue
-            
-            # Parse date
-            try:
-                date = datetime.strptime(date_str, "%d/%m/%Y")
-            except:
-                continue
-            
-            # Clean amount
-            amount = float(amount_str.replace(',', ''))
-            
-            # Clean merchant/description
-            merchant = merchant.strip()
-            
-            # Try to extract category from merchant name
-            category = extract_hdfc_category(merchant)
-            
-            transactions.append({
-                'date': date,
-                'merchant': merchant,
-                'amount': amount,
-                'category': category,
-                'bank': 'HDFC',
-                'card': card,
-            })
-    
-    return pd.DataFrame(transactions)
+# Common HDFC merchant patterns (HDFC already categorizes some transactions)
+HDFC_CATEGORY_KEYWORDS = {
+    'Apparels': ['westside', 'zara', 'h&m', 'max fashion'],
+    'Restaurant': ['zomato', 'swiggy', 'bistro', 'restaurant'],
+    'Groceries': ['blink', 'bigbasket', 'dmart', 'grofers'],
+    'Transport': ['uber', 'ola', 'rapido'],
+}
 
 
 def extract_hdfc_category(merchant):
@@ -139,15 +133,9 @@ def extract_hdfc_category(merchant):
     """
     merchant_lower = merchant.lower()
     
-    # Common HDFC merchant patterns
-    if any(x in merchant_lower for x in ['westside', 'zara', 'h&m', 'max fashion']):
-        return 'Apparels'
-    elif any(x in merchant_lower for x in ['zomato', 'swiggy', 'bistro', 'restaurant']):
-        return 'Restaurant'
-    elif any(x in merchant_lower for x in ['blink', 'bigbasket', 'dmart', 'grofers']):
-        return 'Groceries'
-    elif any(x in merchant_lower for x in ['uber', 'ola', 'rapido']):
-        return 'Transport'
+    for category, pattern in HDFC_CATEGORY_PATTERNS.items():
+        if pattern.search(merchant_lower):
+            return category
     
     return None
 
@@ -166,6 +154,17 @@ CATEGORY_KEYWORDS = {
     'Health': ['pharmacy', 'apollo', 'medplus', 'hospital', 'clinic', 'doctor']
 }
 
+def compile_category_patterns(keyword_table):
+    """Compile each category's keywords into one alternation regex (keywords are lowercase)"""
+    return {
+        category: re.compile('|'.join(map(re.escape, keywords)))
+        for category, keywords in keyword_table.items()
+    }
+
+CATEGORY_PATTERNS = compile_category_patterns(CATEGORY_KEYWORDS)
+HDFC_CATEGORY_PATTERNS = compile_category_patterns(HDFC_CATEGORY_KEYWORDS)
+
+
 def categorize_transaction(merchant, existing_category=None):
     """Categorize transaction based on merchant name"""
     
@@ -178,12 +177,45 @@ def categorize_transaction(merchant, existing_category=None):
     
     merchant_lower = str(merchant).lower()
     
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in merchant_lower for keyword in keywords):
+    for category, pattern in CATEGORY_PATTERNS.items():
+        if pattern.search(merchant_lower):
             return category
     
     return 'Other'
 
+
+def match_categories(merchants, patterns):
+    """
+    Vectorized keyword categorization of a merchant Series
+    
+    Merchants repeat heavily, so each distinct (lower-cased) name is classified
+    once and the result is broadcast back through its factor code. One combined
+    scan over every keyword drops names that match nothing, then each category
+    (in table order) only scans names not yet categorized.
+    
+    Returns:
+        Series with the first matching category (in table order), NaN where nothing matches
+    """
+    codes, uniques = pd.factorize(merchants.str.lower())
+    unique_merchants = pd.Series(uniques, dtype=object)
+    unique_categories = pd.Series(None, index=unique_merchants.index, dtype=object)
+    
+    any_keyword = re.compile('|'.join(pattern.pattern for pattern in patterns.values()))
+    remaining = unique_merchants[unique_merchants.str.contains(any_keyword)]
+    
+    for category, pattern in patterns.items():
+        if remaining.empty:
+            break
+        
+        hit = remaining.str.contains(pattern)
+        unique_categories[hit.index[hit]] = category
+        remaining = remaining[~hit]
+    
+    # Trailing NaN is picked up by code -1 (missing merchant)
+    categories = np.append(unique_categories.to_numpy(), np.nan)[codes]
+    
+    return pd.Series(categories, index=merchants.index, dtype=object)
+
 # ============================================================================
 # MAIN PARSER - Auto-detect bank and parse
 # ============================================================================
@@ -191,13 +223,19 @@ def categorize_transaction(merchant, existing_category=None):
 def detect_bank(text):
     """Detect which bank statement this is"""
     
-    if 'axis bank' in text.lower():
+    text_lower = text.lower()
+    
+    if 'axis bank' in text_lower:
         return 'AXIS'
-    elif 'hdfc bank' in text.lower():
+    elif 'hdfc bank' in text_lower:
         return 'HDFC'
     else:
         return None
     
+# Card-name headers (matched against upper-cased text)
+HDFC_HEADER_PATTERN = re.compile(r"(.+?)\s+HDFC\s+BANK\s+CREDIT\s+CARD\s+STATEMENT", re.DOTALL)
+AXIS_HEADER_PATTERN = re.compile(r"AXIS\s+(.+?)\s+CREDIT CARD")
+
 def detect_card(text):
     """
     Detect credit card name from the PDF text
@@ -206,7 +244,7 @@ def detect_card(text):
     text_upper = text.upper()
 
     # Search for HDFC header robustly
-    match = re.search(r"(.+?)\s+HDFC\s+BANK\s+CREDIT\s+CARD\s+STATEMENT", text_upper, re.DOTALL)
+    match = HDFC_HEADER_PATTERN.search(text_upper)
     if match:
         prefix = match.group(1).replace('\n', ' ').strip()  # replace any newlines
         if "SWIGGY" in prefix:
@@ -217,7 +255,7 @@ def detect_card(text):
             return "HDFC Credit Card"
 
     # Axis Flipkart variant
-    match = re.search(r"AXIS\s+(.+?)\s+CREDIT CARD", text_upper)
+    match = AXIS_HEADER_PATTERN.search(text_upper)
     if match:
         prefix = match.group(1).strip()
         if "FLIPKART" in prefix:
@@ -230,17 +268,28 @@ def detect_card(text):
 
 
 def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file"""
+    """Extract text from PDF file (path or binary file-like object)"""
     
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+        # Read a file path in one go; PDFium then parses from memory instead of
+        # seeking back into the file for every object it loads
+        if isinstance(pdf_path, (str, Path)):
+            pdf_path = Path(pdf_path).read_bytes()
+        
+        # PDFium (C++) extracts text far faster than pure-Python readers
+        with pdfium.PdfDocument(pdf_path) as pdf:
+            pages_text = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                
+                # PDFium ends lines with \r\n; the bank parsers split on \n
+                pages_text.append(textpage.get_text_range().replace('\r\n', '\n') + "\n")
+                
+                # Release the page's native buffers now rather than when the document closes
+                textpage.close()
+                page.close()
             
-            return text
+            return "".join(pages_text)
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return None
@@ -254,7 +303,8 @@ def parse_statement(pdf_path):
     """
     
     # Extract text from PDF
-    print(f"Reading PDF: {pdf_path}")
+    if isinstance(pdf_path, (str, Path)):
+        print(f"Reading PDF: {pdf_path}")
     text = extract_text_from_pdf(pdf_path)
     
     if not text:
@@ -281,10 +331,12 @@ def parse_statement(pdf_path):
         return None
     
     # Apply categorization
-    df['category'] = df.apply(
-        lambda row: categorize_transaction(row['merchant'], row['category']), 
-        axis=1
+    # Bank-provided categories win; the rest are matched on merchant keywords
+    needs_category = df['category'].isna()
+    df.loc[needs_category, 'category'] = match_categories(
+        df.loc[needs_category, 'merchant'], CATEGORY_PATTERNS
     )
+    df['category'] = df['category'].fillna('Other')
     
     # Add formatted date for display
     # df['month'] = df['date'].dt.strftime('%b')
@@ -298,12 +350,44 @@ def parse_statement(pdf_path):
 # BATCH PROCESSING - Parse multiple PDFs
 # ============================================================================
 
+# Column dtypes of the combined frame. Few distinct labels repeat on every row,
+# so category codes shrink the frame and speed up groupbys. Applied once after
+# the concat: per-statement categoricals with different labels would fall back
+# to object when concatenated.
+TRANSACTION_DTYPES = {
+    'date': 'datetime64[ns]',
+    'amount': 'float64',
+    'bank': 'category',
+    'card': 'category',
+    'category': 'category',
+}
+
+def _init_worker():
+    """
+    Give worker processes UTF-8 stdout as well
+    Workers started with spawn (Windows) don't run the __main__ block, so they
+    keep the console encoding and the ✓/₹ progress prints would crash them
+    """
+    # Redirected stdout (e.g. StringIO under fork) has no encoding to fix
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+def _parse_named_statement(name, pdf_path):
+    """Parse one statement with a header line (module-level so worker processes can run it)"""
+    
+    print(f"\n{'='*60}")
+    print(f"Processing: {name}")
+    print('='*60)
+    
+    return parse_statement(pdf_path)
+
 def parse_multiple_statements(pdf_files):
     """
     Parse multiple PDF statements and combine them
     
     Parameters:
         pdf_files: list of PDF file paths or dict like {'Card Name': 'path/to/pdf'}
+                   (dict values may also be binary file-like objects, e.g. io.BytesIO)
     
     Returns:
         Combined DataFrame with all transactions
@@ -317,13 +401,19 @@ def parse_multiple_statements(pdf_files):
     else:
         files_to_process = [(Path(f).stem, f) for f in pdf_files]
     
-    for name, pdf_path in files_to_process:
-        print(f"\n{'='*60}")
-        print(f"Processing: {name}")
-        print('='*60)
-        
-        df = parse_statement(pdf_path)
-        
+    names = [name for name, _ in files_to_process]
+    pdf_paths = [pdf_path for _, pdf_path in files_to_process]
+    
+    # Each PDF is parsed independently and text extraction is CPU-bound,
+    # so spread multiple files across worker processes
+    if len(pdf_paths) > 1:
+        max_workers = min(len(pdf_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            results = list(executor.map(_parse_named_statement, names, pdf_paths))
+    else:
+        results = [_parse_named_statement(name, pdf_path) for name, pdf_path in zip(names, pdf_paths)]
+    
+    for name, df in zip(names, results):
         if df is not None and not df.empty:
             all_transactions.append(df)
         else:
@@ -335,7 +425,11 @@ def parse_multiple_statements(pdf_files):
     
     # Combine all dataframes
     combined_df = pd.concat(all_transactions, ignore_index=True)
-    combined_df = combined_df.sort_values('date').reset_index(drop=True)
+    
+    # Each statement is already date-sorted; a stable merge sort only has to merge those runs
+    combined_df = combined_df.sort_values('date', kind='mergesort', ignore_index=True)
+    
+    combined_df = combined_df.astype(TRANSACTION_DTYPES)
     
     print(f"\n{'='*60}")
     print(f"✅ Total transactions extracted: {len(combined_df)}")
@@ -350,7 +444,8 @@ def parse_multiple_statements(pdf_files):
 # ============================================================================
 
 if __name__ == "__main__":
-    import sys
+    # Emoji and ₹ in the output can't be encoded by legacy Windows consoles (cp1252)
+    sys.stdout.reconfigure(encoding='utf-8')
     
     print("="*70)
     print("MULTI-BANK CREDIT CARD STATEMENT PARSER")
@@ -363,26 +458,40 @@ if __name__ == "__main__":
     # Check if PDF files were provided as arguments
     if len(sys.argv) > 1:
         
-        pdf_files = sys.argv[1:]  # Get ALL arguments after script name
+        # Get ALL arguments after script name, keeping only existing .pdf files
+        # so typos fail here instead of inside the parser's worker processes
+        pdf_files = []
+        for arg in sys.argv[1:]:
+            if Path(arg).suffix.lower() == '.pdf' and os.path.isfile(arg):
+                pdf_files.append(arg)
+            else:
+                print(f"⚠ Warning: Skipping {arg} (not an existing PDF file)")
+        
+        if not pdf_files:
+            sys.exit("\n❌ No valid PDF files to process")
 
         print(f"Processing {len(pdf_files)} PDF files...")
         df = parse_multiple_statements(pdf_files)
         
         if df is not None:
+            # One groupby pass feeds both the per-bank lines and the overall totals
+            by_bank = df.groupby('bank', sort=False, observed=True)['amount'].agg(total='sum', count='size')
+            
             print("\n📊 Combined Summary:")
-            print(f"   Total Transactions: {len(df)}")
-            print(f"   Total Amount: ₹{df['amount'].sum():,.2f}")
+            print(f"   Total Transactions: {by_bank['count'].sum()}")
+            print(f"   Total Amount: ₹{by_bank['total'].sum():,.2f}")
             print(f"\n   By Bank:")
-            for bank, total in df.groupby('bank')['amount'].sum().items():
-                count = len(df[df['bank'] == bank])
+            for bank, total, count in by_bank.itertuples():
                 print(f"      {bank}: ₹{total:,.2f} ({count} transactions)")
             
-            print("\nFirst 10 transactions:")
-            print(df[['date', 'merchant', 'amount', 'category', 'bank']].head(10))
+            # Preview is only for a human at the terminal; skip it when output is redirected
+            if sys.stdout.isatty():
+                print("\nFirst 10 transactions:")
+                print(df[['date', 'merchant', 'amount', 'category', 'bank']].head(10).to_string(index=False))
             
             # Save combined data
             output_file = 'all_transactions_combined.csv'
-            df.to_csv(output_file, index=False)
+            df.to_csv(output_file, index=False, date_format='%Y-%m-%d')
             print(f"\n💾 Saved to: {output_file}")
     
     else: